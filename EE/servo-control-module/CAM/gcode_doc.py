@@ -37,6 +37,7 @@
 
 import numpy as np
 import math
+import copy
 from typing import Any, Union
 
 
@@ -3788,6 +3789,11 @@ class DocSpeedPower(Doc):
     _speeds = None
     _grid = None
 
+    # Label values & square count, cached at construction.
+    _powers_rounded = None
+    _speeds_rounded = None
+    _n_squares = None
+
     # Default sizes
     _square_size = None
     _text_size = None
@@ -3802,6 +3808,11 @@ class DocSpeedPower(Doc):
         self._speeds = np.sort(speeds)
         self._powers = np.sort(powers)
 
+        # Integer values for labels & headers.
+        self._speeds_rounded = np.rint(self._speeds).astype(int)
+        self._powers_rounded = np.rint(self._powers).astype(int)
+        self._n_squares = self._speeds.size * self._powers.size
+
         # Generate the document layout so it can be manipulated.
         # Grid size.  Speeds on rows, power on cols
         rows = len(self._speeds)
@@ -3835,31 +3846,40 @@ class DocSpeedPower(Doc):
         """
 
         # Generate column headers showing power values
-        for col_idx, power in enumerate(self._powers):
-            txt = Text(f"{round(power)}%", size_mm=self._text_size)
-            txt.header = f"Power Label: {round(power)}"
+        for col_idx, power in enumerate(self._powers_rounded):
+            txt = Text(f"{power}%", size_mm=self._text_size)
+            txt.header = f"Power Label: {power}"
             self._grid.AddChildCell(txt, row=0, column=col_idx + 1)
 
         # Generate row headers
         # Fastest speed first.
-        for row_idx, speed in enumerate(np.flip(self._speeds)):
+        for row_idx, speed in enumerate(np.flip(self._speeds_rounded)):
             txt = Text(
-                f"{round(speed)}", size_mm=self._text_size
+                f"{speed}", size_mm=self._text_size
             )  # TODO: Assumes mm/min speeds
-            txt.header = f"Speed Label: {round(speed)}"
+            txt.header = f"Speed Label: {speed}"
             self._grid.AddChildCell(txt, row=row_idx + 1, column=0)
 
         # Generate print squares
-        for i, speed in enumerate(np.flip(self._speeds)):
-            for j, power in enumerate(self._powers):
-                sq = Rectangle(
-                    width=self._square_size,
-                    height=self._square_size,
-                    speed_print=speed,
-                    laser_power=power,
-                )
-                sq.header = f"Power={round(power)}%, Speed={round(speed)}"
-                self._grid.AddChildCell(sq, row=i + 1, column=j + 1)
+        # Speed/power grid matching the label order, fastest speed first.
+        ss, pp = np.meshgrid(np.flip(self._speeds), self._powers, indexing="ij")
+        ss_label, pp_label = np.meshgrid(
+            np.flip(self._speeds_rounded), self._powers_rounded, indexing="ij"
+        )
+        headers = [
+            f"Power={p}%, Speed={s}" for s, p in zip(ss_label.ravel(), pp_label.ravel())
+        ]
+
+        # Squares only differ in speed & power, so copy a single prototype.
+        # Rectangle regenerates rather than mutates its point list, so
+        # shallow copies don't share state once positioned.
+        proto = Rectangle(width=self._square_size, height=self._square_size)
+        for k, (i, j) in enumerate(np.ndindex(ss.shape)):
+            sq = copy.copy(proto)
+            sq.speed_print = ss[i, j]
+            sq.laser_power = pp[i, j]
+            sq.header = headers[k]
+            self._grid.AddChildCell(sq, row=i + 1, column=j + 1)
 
         # Generate axis labels
         grid_labels = GridLayout()  # Default is 2x2
@@ -3886,7 +3906,7 @@ class DocSpeedPower(Doc):
         header += f"Speeds: {self._speeds}" + self.EOL
         header += f"Powers: {self._powers}" + self.EOL
         header += self.EOL
-        header += f"Square Count: {len(self._speeds)*len(self._powers)}" + self.EOL
+        header += f"Square Count: {self._n_squares}" + self.EOL
         header += f"Square Size : {self._square_size}" + self.EOL
         self.header = header
 
@@ -3935,6 +3955,10 @@ class DocFocus(Doc):
     _length = None
     _heights = None
 
+    # Text Size
+    # TODO: Make configurable with reasonable default
+    _text_size = 4
+
     def __init__(self, heights: np.array = np.linspace(-5, 5, 11), length: float = 10):
         super().__init__()
 
@@ -3962,21 +3986,19 @@ class DocFocus(Doc):
         grid.cell_padding_height = 0.75  # Assumes mm
         grid.cell_padding_width = 1
 
-        # Text Size
-        # TODO: Make configurable with reasonable default
-        txt_sz = 4
+        # Row labels
+        # Sign gets added automatically for negative, zero padded to align
+        # 0.0 with signed values.
+        signs = np.where(
+            np.isclose(self._heights, 0), "    ", np.where(self._heights > 0, "+", "")
+        )
+        labels = [f"{sign}{z:.1f}" for sign, z in zip(signs, self._heights)]
 
         # Fill in rows of doc
-        for row, z_height in enumerate(self._heights):
-            sign = ""  # Gets added automatically for negative
-            if z_height > 0:
-                sign = "+"
-            if np.isclose(z_height, 0):
-                sign = "    "  # Aligns 0.0 with signed values
-
+        for row, (z_height, label) in enumerate(zip(self._heights, labels)):
             # Add label
-            txt = Text(f"{sign}{z_height:.1f}", size_mm=txt_sz)
-            txt.header = f"Z offset: {sign}{z_height:0.1f}"
+            txt = Text(label, size_mm=self._text_size)
+            txt.header = f"Z offset: {label}"
             grid.AddChildCell(txt, column=0, row=row)
 
             # Add line
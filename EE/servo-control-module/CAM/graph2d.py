@@ -79,12 +79,18 @@ class Graph2D(nx.Graph):
         # if xy.shape[1]!=2:
         #     raise ValueError('xy must be a 2D array.')
 
+        # Node degrees, extracted once rather than per node.
+        degrees = dict(self.degree())
+
+        # Materialize the components so they can be walked more than once.
+        components = [list(c) for c in nx.connected_components(self)]
+
         # For each component, extract the end points.
         comp_ends = []
-        for component in nx.connected_components(self):
+        for component in components:
 
             # Get the end points
-            end_points = [node for node in component if self.degree(node)==1]
+            end_points = [node for node in component if degrees[node]==1]
 
             # Add the end points to the component
             comp_ends.append(end_points)
@@ -24,7 +24,9 @@ cu_weight_oz = 1
 
 # Calculations
 cu_weight_oz = Q(cu_weight_oz,'oz')
-wt_idx = np.where(wt >= cu_weight_oz)[0][0]
+wt_idx = int(np.searchsorted(wt.to("oz").magnitude, cu_weight_oz.to("oz").magnitude))
+if wt_idx >= wt.size:
+    raise ValueError(f"Copper weight exceeds table maximum: {cu_weight_oz}")
 cu_thick = thick[wt_idx] * (1 + margin)
 
 # All cuts should be slightly deeper
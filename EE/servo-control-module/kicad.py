@@ -2,17 +2,63 @@
 # Python module interface to KiCad 8's CLI kicad-cli
 
 # Python standard modules
+import os
 from pathlib import Path
 import tempfile
-import json
-import xml.etree.ElementTree as ET
-import re
+import subprocess
+from functools import partial
 
 # pip installed modules
-import sh
+try:
+    # libxml2 backed parser, much faster on large IPC-2581 files.
+    from lxml import etree as ET
+
+    # Lift libxml2's size limits for large boards, element IDs are never looked up.
+    _ITERPARSE_ARGS = {'huge_tree':True,'collect_ids':False}
+except ImportError:
+    import xml.etree.ElementTree as ET
+    _ITERPARSE_ARGS = {}
+try:
+    # Compiled JSON decoder, DRC reports can be large.
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
 import gerbonara
-from kinparse import parse_netlist
-from pyparsing.results import ParseResults
+
+# Local modules
+from kicad_netlist import parse_netlist
+
+# IPC-2581 layer reference tag.
+# When parsed, the namespace is expanded per the xmlns link.
+_IPC_LAYER_REF = '{http://webstds.ipc.org/2581}LayerRef'
+
+# RAM backed scratch directory for intermediate reports, if available.
+_TMP_DIR = '/dev/shm' if os.path.isdir('/dev/shm') else None
+
+def _kicad_cli(*args)->str:
+    """
+    Runs kicad-cli with the given arguments.
+    List arguments are flattened and None arguments dropped.
+
+    Returns:
+    - str: Standard output of the command.
+
+    Raises:
+    - subprocess.CalledProcessError: If kicad-cli fails.
+    """
+
+    argv = ['kicad-cli']
+    for arg in args:
+        if arg is None:
+            continue
+        if isinstance(arg,(list,tuple)):
+            argv += [str(a) for a in arg]
+        else:
+            argv.append(str(arg))
+
+    res = subprocess.run(argv,check=True,capture_output=True,text=True)
+
+    return res.stdout
 
 class SCH:
     """KiCad 8 Schematic CLI interface"""
@@ -20,7 +66,7 @@ class SCH:
     def __init__(self,file:str=None) -> None:
 
         # Store the command.
-        self._run = sh.Command('kicad-cli').bake('sch')
+        self._run = partial(_kicad_cli,'sch')
 
         self._file = None
         if file:
@@ -57,17 +103,18 @@ class SCH:
         """
 
         # Run command
-        version = sh.Command('kicad-cli')('--version').strip()
+        version = _kicad_cli('--version').strip()
 
         # Return all
         return version
 
-    def netlist(self)->ParseResults:
+    def netlist(self)->tuple[Path,dict]:
         """
         Generate a netlist from the KiCad schematic file.
 
         Returns:
-        - pyparsing.results.ParseResults: Netlist data.  See: https://devbisme.github.io/kinparse/docs/_build/singlehtml/index.html#document-usage
+        - Path: Path to the netlist file.
+        - dict: Netlist data.  See: parse_netlist
         """
 
         if not self.file:
@@ -119,7 +166,10 @@ class PCB:
     def __init__(self,file:str=None) -> None:
 
         # Store the command.
-        self._run = sh.Command('kicad-cli').bake('pcb')
+        self._run = partial(_kicad_cli,'pcb')
+
+        # Active layers, with the (file, modification time) they were read at.
+        self._layers_cache = None
 
         self._file = None
         if file:
@@ -148,6 +198,7 @@ class PCB:
             raise FileNotFoundError(f"KiCad PCB file not found: {value}")
 
         self._file = value
+        self._layers_cache = None
 
     @property
     def version(self)->str:
@@ -156,7 +207,7 @@ class PCB:
         """
 
         # Run command
-        version = sh.Command('kicad-cli')('--version').strip()
+        version = _kicad_cli('--version').strip()
 
         # Return all
         return version
@@ -166,30 +217,41 @@ class PCB:
         """
         Returns list of active layers in PCB file.
         Generates IPC-2581 output file, then parses for active layers.
+        Results are cached until the PCB file is modified.
         """
 
         if not self.file:
             raise ValueError("KiCad PCB file not set")
 
+        # Reuse results if the PCB hasn't changed.
+        key = (self.file, self.file.stat().st_mtime_ns)
+        if self._layers_cache is not None and self._layers_cache[0] == key:
+            return list(self._layers_cache[1])
 
         # Run command
         outfile = self.file.with_suffix('.xml')
         self._run('export','ipc2581',self.file)
 
-        # Load results
-        tree = ET.parse(outfile)
+        # Stream results, only the LayerRef elements are needed.
+        # Elements are cleared as they close so the full tree is never built.
+        layers = []
+        for _, elem in ET.iterparse(str(outfile), events=('end',), **_ITERPARSE_ARGS):
+            if elem.tag == _IPC_LAYER_REF:
+                # Extract name value, dropping the dialetric layers
+                name = elem.get('name').removeprefix('LAYER:')
+                if not name.startswith('DIELECTRIC'):
+                    layers.append(name)
 
-        # Find all LayerRef elements
-        # When parsed, the namespace is expanded per teh xmlns link.
-        layer_refs = tree.findall('.//{http://webstds.ipc.org/2581}LayerRef')
+            elem.clear()
 
-        # Extract name values
-        layers = [layer_ref.get('name').replace('LAYER:','') for layer_ref in layer_refs]
+            # lxml keeps cleared siblings attached to the parent, release them.
+            if hasattr(elem, 'getprevious'):
+                while elem.getprevious() is not None:
+                    del elem.getparent()[0]
 
-        # Drop the dialetric layers
-        layers = [name for name in layers if not name.startswith('DIELECTRIC')]
+        self._layers_cache = (key, layers)
 
-        return layers
+        return list(layers)
 
     def drc(self)->dict:
         """
@@ -208,12 +270,13 @@ class PCB:
         args += ['--severity-all']
 
         # Run command and load results
-        with tempfile.NamedTemporaryFile(delete=True) as temp:
+        # kicad-cli drc only writes to a file, keep it in RAM where possible.
+        with tempfile.NamedTemporaryFile(suffix='.json',dir=_TMP_DIR,delete=True) as temp:
             args += ['--output',temp.name]
             self._run('drc',args, self.file)
 
             # Read the results
-            results = json.load(temp)
+            results = json_loads(temp.read())
 
         return results
 
@@ -275,37 +338,42 @@ class PCB:
         if not layers:
             layers = board_layers
         else:
+            board_layer_set = frozenset(board_layers)
             layers = []
             for layer in requested_layers:
-                if layer not in board_layers:
+                if layer not in board_layer_set:
                     print(f"WARNING: requested layer not in PCB, skipping: {layer}")
                     continue
                 layers.append(layer)
 
-        layer_str = ''
-        for layer in layers:
-            layer_str += layer + ','
-        layer_str = layer_str[:-1]
+        if not layers:
+            print("WARNING: no layers to export")
+            return []
+
+        layer_str = ','.join(layers)
         args = ['--layers',layer_str]
 
-        print(f"Exporting layers: {','.join(layers)}")
+        # Have kicad-cli write '.gbr' files directly rather than Protel
+        # extensions, so no renaming is needed.
+        args += ['--no-protel-ext']
+
+        print(f"Exporting layers: {layer_str}")
 
         # Run command
-        res = self._run('export','gerbers',args, self.file)
+        self._run('export','gerbers',args, self.file)
 
-        # Find all generated file names
-        files = re.findall(r"'(.*?)'", res)
-        newfiles = []
-        for file in files:
-            file = Path(file)
-            newfile = Path(file).with_suffix('.gbr')
-            file.rename(newfile)
-            newfiles.append(newfile)
+        # Generated file names follow KiCad's <board>-<layer>.gbr convention.
+        newfiles = [Path(f"{self.file.stem}-{layer.replace('.','_')}.gbr") for layer in layers]
 
         # Include the jobfile.
         jobfile = self.file.stem + '-job.gbrjob'
         newfiles.append(Path(jobfile))
 
+        # Names are predicted rather than read from kicad-cli, so check them.
+        missing = [str(file) for file in newfiles if not file.is_file()]
+        if missing:
+            raise FileNotFoundError(f"Expected Gerber files not generated: {', '.join(missing)}")
+
         return newfiles
 
 def clean():
@@ -313,27 +381,24 @@ def clean():
     Removes all KiCad module generated files.
     """
 
+    # Single directory scan, classify each file by suffix.
+    with os.scandir('.') as it:
+        files = [Path(entry.name) for entry in it if entry.is_file()]
+
     # List all projects in the current directory
-    projects = list(Path('.').glob('*.kicad_pro'))
-    extensions = ['.drl','.dxf','.json','.net','.pdf',
-                  '.rpt','.svg','.pdf','.wrl','.step',
-                  '.xml','.gbr','.gbrjob']
-
-    # Remove all files with the extensions
-    for project in projects:
-        for ext in extensions:
-            file = project.with_suffix(ext)
-            if file.is_file():
-                file.unlink()
-
-        # Gerbers have a modified filename
-        gerbers = list(Path('.').glob(f'{project.stem}*.gbr'))
-        for gerber in gerbers:
-            gerber.unlink()
-
-        gerber_job = list(Path('.').glob(f'{project.stem}*.gbrjob'))
-        for job in gerber_job:
-            job.unlink()
+    projects = tuple(file.stem for file in files if file.suffix == '.kicad_pro')
+    extensions = frozenset({'.drl','.dxf','.json','.net','.pdf',
+                            '.rpt','.svg','.wrl','.step','.xml'})
+
+    # Gerbers have a modified filename
+    gerber_extensions = frozenset({'.gbr','.gbrjob'})
+
+    # Remove all project files with the extensions
+    for file in files:
+        if file.suffix in extensions and file.stem in projects:
+            file.unlink()
+        elif file.suffix in gerber_extensions and file.name.startswith(projects):
+            file.unlink()
 
 
 
@@ -0,0 +1,79 @@
+# kicad_netlist.py
+# KiCad netlist parser.
+# Kept apart from kicad.py so scripts that only read netlists don't pay for
+# its kicad-cli and Gerber dependencies.
+
+# Python standard modules
+from pathlib import Path
+import re
+
+# Netlist S-expression tokens: parens, quoted strings & bare atoms.
+_SEXPR_TOKEN_RE = re.compile(r'\(|\)|"(?:[^"\\]|\\.)*"|[^\s()]+')
+
+# Netlist fields kept, mapped from S-expression keyword to dict key.
+_PART_FIELDS = {'ref':'ref','value':'value','footprint':'footprint','datasheet':'datasheet'}
+_NET_FIELDS = {'code':'code','name':'name'}
+_PIN_FIELDS = {'ref':'ref','pin':'num','pintype':'type','pinfunction':'function'}
+
+def _sexpr_fields(clause:list,fields:dict)->dict:
+    """
+    Extracts (keyword value) sub-clauses of an S-expression clause to a dict.
+    Only keywords in fields are kept, keyed by their mapped name.
+    """
+
+    return {fields[item[0]]:item[1] for item in clause[1:]
+            if isinstance(item,list) and len(item) > 1 and item[0] in fields}
+
+def parse_netlist(file:str)->dict:
+    """
+    Parses a KiCad netlist file.
+    Single pass scanner over the S-expression text, only keeps the part and net
+    fields used by this project.
+
+    Args:
+    - file (str): KiCad netlist '.net' file.
+
+    Returns:
+    - dict: Netlist data with keys:
+        - 'parts': list of dicts with 'ref', 'value', 'footprint' & 'datasheet' keys (when present).
+        - 'nets': list of dicts with 'code', 'name' & 'pins' keys.
+          Pins are dicts with 'ref', 'num', 'type' & 'function' keys (when present).
+    """
+
+    data = Path(file).read_text()
+
+    # Build nested lists, one per parenthesized clause.
+    stack = [[]]
+    for token in _SEXPR_TOKEN_RE.findall(data):
+        if token == '(':
+            stack.append([])
+        elif token == ')':
+            clause = stack.pop()
+            stack[-1].append(clause)
+        elif token[0] == '"':
+            stack[-1].append(token[1:-1].replace('\\"','"').replace('\\\\','\\'))
+        else:
+            stack[-1].append(token)
+
+    # Top level is the (export ...) clause.
+    export = stack[0][0]
+
+    netlist = {'parts':[],'nets':[]}
+    for section in export[1:]:
+        if not isinstance(section,list):
+            continue
+
+        if section[0] == 'components':
+            netlist['parts'] = [_sexpr_fields(comp,_PART_FIELDS) for comp in section[1:]
+                                if isinstance(comp,list) and comp[0] == 'comp']
+
+        elif section[0] == 'nets':
+            for net in section[1:]:
+                if not isinstance(net,list) or net[0] != 'net':
+                    continue
+                entry = _sexpr_fields(net,_NET_FIELDS)
+                entry['pins'] = [_sexpr_fields(node,_PIN_FIELDS) for node in net[1:]
+                                 if isinstance(node,list) and node[0] == 'node']
+                netlist['nets'].append(entry)
+
+    return netlist
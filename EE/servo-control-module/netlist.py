@@ -16,97 +16,104 @@
 # TODO: Integrate w/COG and make part of the build.
 
 
-from kinparse import parse_netlist
+import sys
+
+from kicad_netlist import parse_netlist
 
 # TODO: Define some macros that define pin based on connection.
 
 # Read the netlist
 fn = "servo-control-module.net"
-nl = parse_netlist(fn).as_dict()
+nl = parse_netlist(fn)
 
 # Generate dict of components keyed by ref
 parts = {p["ref"]: p for p in nl["parts"]}
 
 # Generate dict of nets keyed by net name.
-nets = {p["name"]: p for p in nl["nets"]}
-
+# Drop unconnected nets and the power nets.
 # TODO: Drop nets not connected to an MCU.
+skip_prefix = "unconnected-"
+skip_names = {"+5V", "GND"}
+nets = {
+    p["name"]: p
+    for p in nl["nets"]
+    if not p["name"].startswith(skip_prefix) and p["name"] not in skip_names
+}
+
+# Output lines, written in one go at the end.
+out = []
 
-# Drop unconnected nets
-nets = {k: v for k, v in nets.items() if not k.startswith("unconnected-")}
+# Device pin type to MCU pin direction & arrow.
+mcu_dirs = {"input": ("output", "->"), "output": ("input", "<-")}
 
-# Drop the power nets
-nets.pop("+5V")
-nets.pop("GND")
+# MCU references
+mcu_refs = frozenset(ref for ref in parts if ref.startswith("U"))
 
 # MCU data sheets.
 for ref, data in parts.items():
-    if ref.startswith("U"):
+    if ref in mcu_refs:
         if "datasheet" in data:
-            print(f"  // MCU: {data['value']} ({ref})")
-            print(f'  // Datasheet: {data["datasheet"]}')
-print("")
+            out.append(f"  // MCU: {data['value']} ({ref})")
+            out.append(f'  // Datasheet: {data["datasheet"]}')
+out.append("")
 
 
 # Active part pin mappings.
 for net, nodes in nets.items():
     nodes = nodes["pins"]
     if len(nodes) != 2:
-        print(f"Net '{net}' not a simple net, skipping\n")
+        out.append(f"Net '{net}' not a simple net, skipping\n")
         continue
 
-    if nodes[0]["ref"].startswith("U"):
+    if nodes[0]["ref"] in mcu_refs:
         mcu = nodes[0]
         device = nodes[1]
-    elif nodes[1]["ref"].startswith("U"):
+    elif nodes[1]["ref"] in mcu_refs:
         mcu = nodes[1]
         device = nodes[0]
     else:
-        print(f"Net '{net}' does not have a MCU pin, skipping.\n")
+        out.append(f"Net '{net}' does not have a MCU pin, skipping.\n")
         continue
 
+    mcu_part = parts[mcu["ref"]]
+    device_part = parts[device["ref"]]
+
     # Look for LED's
     # Pin 2 acts as input
-    if parts[device["ref"]] == "LED":
-        if device["pin"] == "2":
+    if device_part["value"] == "LED":
+        if device["num"] == "2":
             device["type"] = "input"
 
-    if device["type"] == "input":
-        mcu_dir = "output"
-        mcu_dir_arrow = "->"
-    elif device["type"] == "output":
-        mcu_dir = "input"
-        mcu_dir_arrow = "<-"
-    else:
-        mcu_dir = "unknown"
-        mcu_dir_arrow = "<-??->"
+    mcu_dir, mcu_dir_arrow = mcu_dirs.get(device.get("type"), ("unknown", "<-??->"))
 
-    mcu_name = parts[mcu["ref"]]["value"]
-    device_name = parts[device["ref"]]["value"]
-    print(
+    mcu_name = mcu_part["value"]
+    device_name = device_part["value"]
+    out.append(
         f"  // Net {net}: {mcu_name} ({mcu['ref']}) pin {mcu['num']} {mcu_dir_arrow} {device_name} ({device['ref']}) pin {device['num']}"
     )
 
     # MCU pin/port mapping
-    print(f"  // {mcu_name}: pin {mcu['num']} = {mcu['function']}")
+    out.append(f"  // {mcu_name}: pin {mcu['num']} = {mcu['function']}")
 
     # MCU Port extraction
     # TODO: This should be smarter in looking for PxYY name.
     fcn = mcu["function"].split("/")[-1]
     port = fcn[1]
-    print(f"  // {fcn} as {mcu_dir} ")
+    out.append(f"  // {fcn} as {mcu_dir} ")
 
     # Clean up device name.
     device_name = device_name.replace(" ", "_")
 
     # Macro
     pin_name = f"PIN_{device_name}"
-    print(f"  #define {pin_name} ({fcn})")
+    out.append(f"  #define {pin_name} ({fcn})")
 
     # FW Note
     if mcu_dir == "output":
-        print(f"  DDR{port} |= (1 << {pin_name});")
+        out.append(f"  DDR{port} |= (1 << {pin_name});")
     elif mcu_dir == "input":
-        print(f"  DDR{port} &= ~(1 << {pin_name});")
+        out.append(f"  DDR{port} &= ~(1 << {pin_name});")
+
+    out.append("")
 
-    print("")
+sys.stdout.write("\n".join(out) + "\n")
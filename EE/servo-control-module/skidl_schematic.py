@@ -1,6 +1,7 @@
 import os
 
 # Linux install
+# SKiDL reads the symbol path on import, so must be set first.
 os.environ["KICAD8_SYMBOL_DIR"] = "/usr/share/kicad/symbols/"
 
 # Windows install mapped drive
@@ -9,59 +10,68 @@ os.environ["KICAD8_SYMBOL_DIR"] = "/usr/share/kicad/symbols/"
 # )
 
 
-from skidl import *
+from skidl import KICAD8, NC, POWER, Net, Part, Pin, generate_graph, set_default_tool
 
-set_default_tool(KICAD8)
 
-# Nets
-net_v5 = Net("+5V")
-net_gnd = Net("GND")
+def circuit():
+    """
+    Builds the servo control module circuit.
+    """
 
-net_servo = Net("Servo")
-net_analog = Net("Analog")
+    # Nets
+    net_v5 = Net("+5V")
+    net_gnd = Net("GND")
 
-# Connectors
-conn_pwr = Part(
-    lib="Connector",
-    name="Conn_01x05_Pin",
-)
+    net_servo = Net("Servo")
+    net_analog = Net("Analog")
 
-conn_servo = Part(
-    lib="Connector",
-    name="Screw_Terminal_01x03",
-    footprint="TerminalBlock_TE-Connectivity:TerminalBlock_TE_282834-3_1x03_P2.54mm_Horizontal",
-)
+    # Connectors
+    conn_pwr = Part(
+        lib="Connector",
+        name="Conn_01x05_Pin",
+    )
 
-# Parts
-mcu = Part(lib="MCU_Microchip_ATtiny", name="ATtiny85-20P")
-pot = Part(lib="Device", name="R_Potentiometer")
+    conn_servo = Part(
+        lib="Connector",
+        name="Screw_Terminal_01x03",
+        footprint="TerminalBlock_TE-Connectivity:TerminalBlock_TE_282834-3_1x03_P2.54mm_Horizontal",
+    )
 
+    # Parts
+    mcu = Part(lib="MCU_Microchip_ATtiny", name="ATtiny85-20P")
+    pot = Part(lib="Device", name="R_Potentiometer")
 
-# Connections
-conn_pwr[1] += net_v5
-conn_pwr[1].drive = POWER
-conn_pwr[5] += net_gnd
-conn_pwr[5].drive = POWER
-conn_pwr[2:4] += NC
 
-conn_servo[1] += net_v5
-conn_servo[2] += net_servo
-conn_servo[2].func = Pin.types.OUTPUT
-conn_servo[3] += net_gnd
+    # Connections
+    conn_pwr[1] += net_v5
+    conn_pwr[1].drive = POWER
+    conn_pwr[5] += net_gnd
+    conn_pwr[5].drive = POWER
+    conn_pwr[2:4] += NC
 
-mcu[:] += NC  # By default, all pins disconnected.
-mcu["VCC"] += net_v5
-mcu["GND"] += net_gnd
-mcu["PB2"] += net_servo
-mcu["PB3,p2"] += net_analog
+    conn_servo[1] += net_v5
+    conn_servo[2] += net_servo
+    conn_servo[2].func = Pin.types.OUTPUT
+    conn_servo[3] += net_gnd
 
-pot[1] += net_v5
-pot[2] += net_analog
-pot[2].func = Pin.types.INPUT
-pot[3] += net_gnd
+    mcu[:] += NC  # By default, all pins disconnected.
+    mcu["VCC"] += net_v5
+    mcu["GND"] += net_gnd
+    mcu["PB2"] += net_servo
+    mcu["PB3,p2"] += net_analog
 
-# Outputs
-# generate_netlist(file_="skidl_netlist.net") # Works
-# generate_schematic()  # file_="skidl_schematic.sch") # Currently only KiCad 5.1.10
-generate_graph()  # DOT
-# generate_svg()  # Not working
+    pot[1] += net_v5
+    pot[2] += net_analog
+    pot[2].func = Pin.types.INPUT
+    pot[3] += net_gnd
+
+
+if __name__ == "__main__":
+    set_default_tool(KICAD8)
+    circuit()
+
+    # Outputs
+    # generate_netlist(file_="skidl_netlist.net") # Works
+    # generate_schematic()  # file_="skidl_schematic.sch") # Currently only KiCad 5.1.10
+    generate_graph()  # DOT
+    # generate_svg()  # Not working
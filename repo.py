@@ -7,14 +7,20 @@
 import os
 import re
 import warnings
+import weakref
+import subprocess
 import sh
-import shutil
 import json
 import datetime
 import pandas as pd
 from collections import OrderedDict
+from collections.abc import Mapping
 import logging
 from typing import List
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
 
 # Future Features:
 # - Repo figures out if it's BitBucket or GitHub.
@@ -24,6 +30,12 @@ from typing import List
 # - Abstract metrics into their own file so they're more easily modified.
 # - Set up as proper Python module so easier to install dependencies.
 
+# Pull request number in a merge commit subject.
+_PR_RE = re.compile(r"\(pull request #(\d+)\)")
+
+# Object types reported by 'git cat-file --batch'.
+_GIT_OBJECT_TYPES = (b"blob", b"tree", b"commit", b"tag")
+
 
 def html_table_add_row(
     table: str = None, param: str = "Parameter", value: str = ""
@@ -51,15 +63,22 @@ def html_table_add_row(
     if not isinstance(value, str):
         raise TypeError("value must be a string.")
 
-    html = "<tr>"
-    html += f"<th><b>{param}</b></th>"
-    html += f"<td>{value}</td>"
-    html += "</tr>"
-    html += "</table>"
+    return table.replace("</table>", html_table_row(param, value) + "</table>")
 
-    table = table.replace("</table>", html)
 
-    return table
+def html_table_row(param: str, value: str) -> str:
+    """
+    HTML table row with a parameter and its value.
+
+    Args:
+        param (str): Parameter name.
+        value (str): Parameter value.
+
+    Returns:
+        str: HTML table row.
+    """
+
+    return f"<tr><th><b>{param}</b></th><td>{value}</td></tr>"
 
 
 def url_to_html(url: str, text: str = None) -> str:
@@ -88,6 +107,15 @@ def url_to_html(url: str, text: str = None) -> str:
     return html
 
 
+def _close_process(proc: subprocess.Popen) -> None:
+    """
+    Closes a coprocess' stdin and waits for it to exit.
+    """
+
+    proc.stdin.close()
+    proc.wait()
+
+
 class Commit:
     """
     Commit data for an existing commit, immutable.
@@ -106,9 +134,14 @@ class Commit:
         self._repo = repo
 
         if isinstance(timestamp, str):
-            self._timestamp = datetime.datetime.strptime(
-                timestamp, "%Y-%m-%d %H:%M:%S %z"
-            )
+            # Strict ISO 8601 from 'git log --format=%aI' is the fast path,
+            # '%ai' style strings are still accepted.
+            try:
+                self._timestamp = datetime.datetime.fromisoformat(timestamp)
+            except ValueError:
+                self._timestamp = datetime.datetime.strptime(
+                    timestamp, "%Y-%m-%d %H:%M:%S %z"
+                )
         if isinstance(timestamp, datetime.datetime):
             self._timestamp = timestamp
 
@@ -118,12 +151,9 @@ class Commit:
         self._metrics = {}
 
         # Capture metric data if it exists for this commit.
-        # Check for tags on this Commit.  If a metric tag, read the data.
-        for tag in self.tags:
-            if "metrics-" in tag:
-                data = self._repo.git.tag("-l", "--format=%(contents)", tag)
-                data = data.strip()
-                self._metrics = json.loads(data)
+        data = self._repo.metrics_by_sha.get(self.sha)
+        if data is not None:
+            self._metrics = json_loads(data)
 
     def __str__(self) -> str:
         """
@@ -190,10 +220,7 @@ class Commit:
             str: Tags associated with commit.
         """
 
-        tags = self._repo.git.tag("--points-at", self.sha)
-        tags = tags.splitlines()
-
-        return tags
+        return list(self._repo.tags_by_sha.get(self.sha, []))
 
     @property
     def timestamp(self) -> datetime.datetime:
@@ -216,7 +243,7 @@ class Commit:
             int: Pull request number of commit.
         """
 
-        pr = re.search("\(pull request #(\d+)\)", self.subject)
+        pr = _PR_RE.search(self.subject)
         if pr is None:
             return None
 
@@ -341,6 +368,7 @@ class Commit:
         # Tag the repo.
         data = json.dumps(self.metrics)
         self._repo.git.tag("-a", tagstr, "-m", data)
+        self._repo._cache.pop("tags", None)
 
         # Push this tag.
         self._repo.git.push("origin", tagstr)
@@ -353,15 +381,41 @@ class Commit:
             str: HTML formatted table.
         """
 
-        url = url_to_html(self._repo.url_base)
-        table = html_table_add_row(param="Repo URL", value=url)
+        rows = [
+            html_table_row("Repo URL", url_to_html(self._repo.url_base)),
+            html_table_row("Branch", self._repo.branch),
+            html_table_row("Commit", url_to_html(url=self.url, text=self.sha[:6])),
+        ]
+
+        return "<table>" + "".join(rows) + "</table>"
+
+
+class CommitMap(Mapping):
+    """
+    Read only mapping of commits built from 'git log' records.
+    Each Commit is created on first lookup, so callers after a single
+    entry don't pay for all of them.
+    """
+
+    def __init__(self, repo, records: dict):
+        self._repo = repo
+        self._records = records
+        self._commits = {}
+
+    def __getitem__(self, key) -> Commit:
+        if key not in self._commits:
+            self._commits[key] = Commit(self._repo, **self._records[key])
 
-        table = html_table_add_row(table=table, param="Branch", value=self._repo.branch)
+        return self._commits[key]
 
-        url = url_to_html(url=self.url, text=self.sha[:6])
-        table = html_table_add_row(table=table, param="Commit", value=url)
+    def __iter__(self):
+        return iter(self._records)
 
-        return table
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def __repr__(self) -> str:
+        return f"CommitMap({list(self._records)})"
 
 
 class Repo:
@@ -384,8 +438,15 @@ class Repo:
         # URL to repo
         self._url_base = None
 
+        # Results of git queries, see _cached().
+        self._git_dir = None
+        self._cache = {}
+
+        # Persistent 'git cat-file --batch' process, started on first use.
+        self._catfile = None
+
         # Log format string.
-        self._log_format = '--format={"sha":"%H","timestamp":"%ai","subject":"%s","author":"%aN","author_email":"%aE"}'
+        self._log_format = '--format={"sha":"%H","timestamp":"%aI","subject":"%s","author":"%aN","author_email":"%aE"}'
 
     def __str__(self) -> str:
         """
@@ -442,6 +503,30 @@ class Repo:
 
         return not self.is_dirty
 
+    def _run(self, *args, check: bool = True) -> str:
+        """
+        Runs a git command in the repository and returns its output.
+        Used for the frequently called queries, where sh's per call
+        overhead adds up.
+
+        Args:
+            *args: git arguments.
+            check (bool, optional): Raise on non-zero exit. Defaults to True.
+
+        Returns:
+            str: Command stdout.
+        """
+
+        res = subprocess.run(
+            ("git", "--no-pager", *args),
+            cwd=self._dir,
+            check=check,
+            capture_output=True,
+            text=True,
+        )
+
+        return res.stdout
+
     @property
     def git(self) -> sh.Command:
         """
@@ -462,11 +547,123 @@ class Repo:
             list: Repository status lines per "git status --porcelain"
         """
 
-        status = self.git.status("--porcelain").splitlines()
+        status = self._run("status", "--porcelain").splitlines()
         status = [line.strip() for line in status]
 
         return status
 
+    @property
+    def git_dir(self) -> str:
+        """
+        Absolute path of the repository's .git directory.
+
+        Returns:
+            str: Path of git directory.
+        """
+
+        if self._git_dir is None:
+            self._git_dir = self._run("rev-parse", "--absolute-git-dir").strip()
+
+        return self._git_dir
+
+    def _cached(self, name: str, paths: list, func):
+        """
+        Returns the cached result of func() while none of the given
+        git files have changed, otherwise calls func() again.
+
+        Args:
+            name (str): Cache entry name.
+            paths (list): Paths relative to the git directory to check.
+            func (callable): Function computing the value.
+
+        Returns:
+            Value returned by func().
+        """
+
+        key = []
+        for path in paths:
+            try:
+                st = os.stat(os.path.join(self.git_dir, path))
+                key.append((st.st_mtime_ns, st.st_size))
+            except FileNotFoundError:
+                key.append(None)
+
+        entry = self._cache.get(name)
+        if entry is not None and entry[0] == key:
+            return entry[1]
+
+        value = func()
+        self._cache[name] = (key, value)
+
+        return value
+
+    @property
+    def tags_by_sha(self) -> dict:
+        """
+        Tag names keyed by the SHA of the commit they point at.
+        Read with a single 'git for-each-ref' and cached until the tag
+        refs change, so Commit objects don't each need a
+        'git tag --points-at' call.
+
+        Returns:
+            dict: Lists of tag names keyed by commit SHA.
+        """
+
+        return self._tags()[0]
+
+    @property
+    def metrics_by_sha(self) -> dict:
+        """
+        Metric tag message keyed by the SHA of the commit it points at.
+        Comes from the same 'git for-each-ref' as tags_by_sha, so
+        metric data doesn't need a 'git tag' call per tag.
+
+        Returns:
+            dict: Metric JSON strings keyed by commit SHA.
+        """
+
+        return self._tags()[1]
+
+    def _tags(self) -> tuple:
+        """
+        Tag names and metric tag messages keyed by commit SHA, cached
+        until the tag refs change.
+
+        Returns:
+            tuple: tags_by_sha and metrics_by_sha dictionaries.
+        """
+
+        # Tags in subdirectories (e.g. 'v/1.0') only change the mtime of
+        # their own directory, so every directory under refs/tags counts.
+        paths = ["packed-refs"]
+        for root, _, _ in os.walk(os.path.join(self.git_dir, "refs", "tags")):
+            paths.append(os.path.relpath(root, self.git_dir))
+
+        return self._cached("tags", paths, self._tags_read)
+
+    def _tags_read(self) -> tuple:
+        # Annotated tags peel to their commit via %(*objectname),
+        # lightweight tags point at it directly via %(objectname).
+        # Messages span lines, so fields and records are NUL terminated.
+        refs = self._run(
+            "for-each-ref",
+            "--format=%(objectname)%00%(*objectname)%00"
+            "%(refname:short)%00%(contents)%00",
+            "refs/tags",
+        )
+        fields = refs.split("\0")
+
+        tags = {}
+        metrics = {}
+        for i in range(0, len(fields) - 1, 4):
+            sha, peeled, name, contents = fields[i : i + 4]
+            sha = peeled or sha.lstrip("\n")
+            tags.setdefault(sha, []).append(name)
+            if "metrics-" in name:
+                metrics[sha] = contents.strip()
+
+        return tags, metrics
+
     @property
     def url_base(self) -> str:
         """
@@ -503,8 +700,10 @@ class Repo:
             str: Branch name
         """
 
-        br = self.git.branch("--show-current").strip()
-        return br
+        # Only changes when HEAD is rewritten.
+        return self._cached(
+            "branch", ["HEAD"], lambda: self._run("branch", "--show-current").strip()
+        )
 
     @property
     def url(self) -> str:
@@ -565,8 +764,8 @@ class Repo:
             Commit: Commit object for current commit.
         """
 
-        commit = self._git.log("-n1", self._log_format).strip()
-        commit = json.loads(commit)
+        commit = self._run("log", "-n1", self._log_format).strip()
+        commit = json_loads(commit)
         commit = Commit(self, **commit)
         return commit
 
@@ -581,58 +780,155 @@ class Repo:
             Commit: Commit object with given SHA or None if not found.
         """
 
+        # One 'git log' so .mailmap applies as for every other Commit.
+        # '--' keeps a file name from being taken as a path filter.
         try:
-            commit = self._git.log("-n1", self._log_format, sha).strip()
-            commit = json.loads(commit)
-            commit = Commit(self, **commit)
-        except:  # noqa: E722
-            commit = None
+            commit = self._run("log", "-n1", self._log_format, sha, "--").strip()
+        except subprocess.CalledProcessError:
+            return None
+
+        if not commit:
+            return None
+
+        commit = json_loads(commit)
+        commit = Commit(self, **commit)
 
         return commit
 
-    def pullrequests(self) -> dict:
+    def _read_object(self, rev: str) -> tuple:
         """
-        Generate dictionary of commits keyed by pull request number.
+        Reads an object through a persistent 'git cat-file --batch'
+        process, saving a git launch per lookup.
+
+        Args:
+            rev (str): Object name, e.g. a SHA or '<sha>:<path>'.
 
         Returns:
-            dict: Dictionary of commits keyed by pull request number.
+            tuple: Object SHA, type and contents, or (None, None, None)
+                   if the object does not exist.
         """
 
-        # git log --grep "pull request" --format="%h  %ai %s %d" --tags
-        # Commits is now a list of dictionaries of commit info for commits with 'pull request' in the subject.
-        commits = self._git.log("--grep", "pull request", self._log_format)
-        commits = commits.splitlines()
-        commits = [json.loads(commit) for commit in commits]
+        if "\n" in rev:
+            return None, None, None
 
-        ids = [
-            int(re.search("\(pull request #(\d+)\)", commit["subject"]).group(1))
-            for commit in commits
-        ]
+        if self._catfile is None:
+            self._catfile = subprocess.Popen(
+                ["git", "--no-pager", "cat-file", "--batch"],
+                cwd=self._dir,
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+            )
+            weakref.finalize(self, _close_process, self._catfile)
+
+        self._catfile.stdin.write(rev.encode() + b"\n")
+        self._catfile.stdin.flush()
+
+        # '<sha> <type> <size>' followed by the contents and a newline,
+        # or '<rev> missing' / '<rev> ambiguous'.  The rev may itself
+        # contain spaces, so check for those replies before splitting.
+        header = self._catfile.stdout.readline().rstrip(b"\n")
+        if header.endswith((b" missing", b" ambiguous")):
+            return None, None, None
+
+        header = header.split()
+        if len(header) != 3 or header[1] not in _GIT_OBJECT_TYPES:
+            return None, None, None
+
+        sha, kind, size = header
+        raw = self._catfile.stdout.read(int(size) + 1)[:-1]
+
+        return sha.decode(), kind.decode(), raw
 
-        commits = [Commit(self, **commit) for commit in commits]
+    def _iter_log(self, *args, max_count: int = None):
+        """
+        Streams Commit objects from 'git log', building each one as its
+        record arrives instead of after the whole log has been read.
+
+        Args:
+            *args: Extra 'git log' arguments.
+            max_count (int, optional): Limit on commits returned. Defaults to None.
+
+        Yields:
+            Commit: Commits in 'git log' order.
+        """
+
+        for record in self._iter_log_records(*args, max_count=max_count):
+            yield Commit(self, **record)
+
+    def _iter_log_records(self, *args, max_count: int = None):
+        """
+        Streams commit records from 'git log' as Commit keyword argument
+        dictionaries.
+
+        Args:
+            *args: Extra 'git log' arguments.
+            max_count (int, optional): Limit on commits returned. Defaults to None.
+
+        Yields:
+            dict: Commit records in 'git log' order.
+        """
+
+        cmd = ["git", "--no-pager", "log", "-z", self._log_format]
+        if max_count is not None:
+            cmd.append(f"--max-count={max_count}")
+        cmd.extend(str(arg) for arg in args)
+
+        with subprocess.Popen(cmd, cwd=self._dir, stdout=subprocess.PIPE) as proc:
+            # Records are NUL separated, carry any partial one over to
+            # the next read.  The complete records in each read are
+            # decoded together as one JSON array.
+            pending = b""
+            for chunk in iter(lambda: proc.stdout.read1(65536), b""):
+                *records, pending = (pending + chunk).split(b"\0")
+                yield from json_loads(b"[" + b",".join(records) + b"]")
+            if pending:
+                yield json_loads(pending)
+
+        if proc.returncode:
+            raise subprocess.CalledProcessError(proc.returncode, cmd)
+
+    def pullrequests(self, max_count: int = None) -> CommitMap:
+        """
+        Generate mapping of commits keyed by pull request number.
+        Commit objects are only built when looked up.
+
+        Args:
+            max_count (int, optional): Limit on commits searched. Defaults to None.
+
+        Returns:
+            CommitMap: Mapping of commits keyed by pull request number.
+        """
+
+        # Let git do the filtering.  --grep matches the whole message,
+        # only keep subject matches.
+        records = self._iter_log_records(
+            "-E", "--grep=\\(pull request #[0-9]+\\)", max_count=max_count
+        )
+
+        prs = {}
+        for record in records:
+            pr = _PR_RE.search(record["subject"])
+            if pr is not None:
+                prs[int(pr.group(1))] = record
 
-        return dict(zip(ids, commits))
+        return CommitMap(self, prs)
 
-    def tags(self, tag_re: str = "*") -> list:
+    def tags(self, tag_re: str = "*", max_count: int = None) -> list:
         """
         Generates list of commits identified by given tag regular expression.
         If no regular expression string provided, returns all tagged commits.
 
         Args:
             tag_re (str, optional): Tag regex filter string. Defaults to None.
+            max_count (int, optional): Limit on commits returned. Defaults to None.
 
         Returns:
             list: List of commits with matching tags.
         """
 
-        # List of tags
-        tags = self._git.log("--no-walk", f"--tags={tag_re}", self._log_format)
-        commits = tags.splitlines()
+        commits = self._iter_log("--no-walk", f"--tags={tag_re}", max_count=max_count)
 
-        # Get commit info associated with each tag.
-        commits = [json.loads(commit) for commit in commits]
-
-        return [Commit(self, **commit) for commit in commits]
+        return list(commits)
 
     def releases(self, tag_re: str = "release-*") -> dict:
         """
@@ -736,8 +1032,8 @@ class Repo:
 
         # Get Commit object for that SHA
         try:
-            commit = self._git.log("-n1", remote, self._log_format).strip()
-            commit = json.loads(commit)
+            commit = self._run("log", "-n1", remote, self._log_format).strip()
+            commit = json_loads(commit)
             commit = Commit(self, **commit)
         except:  # noqa: E722
             commit = None
@@ -766,28 +1062,23 @@ class Repo:
             pd.DataFrame: DataFrame of metric data.
         """
 
-        df = pd.DataFrame()
-
-        # List of metric tags
-        commits = self.metric_commits()
-        commits = list(commits.values())
-
-        # Convert those to DataFrame
-        metrics = [commit.metrics for commit in commits]
-        df = pd.DataFrame(metrics)
-        cols = list(df.columns)
-
-        # Add in commit metadata
-        df["SHA"] = [commit.sha[:6] for commit in commits]
-        df["Time Stamp"] = [commit.timestamp for commit in commits]
-        df["Pull Request"] = [commit.pr for commit in commits]
-        df["Author"] = [commit.author for commit in commits]
-
-        # Order columns nicely
-        cols = self._metadata_cols + cols
-        df = df[cols]
+        # One record per metric tagged commit, metadata and metrics
+        # together.  Metric columns are kept in first seen order.
+        records = []
+        cols = {}
+        for commit in self.metric_commits().values():
+            cols.update(dict.fromkeys(commit.metrics))
+            records.append(
+                {
+                    "Time Stamp": commit.timestamp,
+                    "SHA": commit.sha[:6],
+                    "Pull Request": commit.pr,
+                    "Author": commit.author,
+                    **commit.metrics,
+                }
+            )
 
-        return df
+        return pd.DataFrame(records, columns=self._metadata_cols + list(cols))
 
     def file_history(self, filename: str = None, n: int = None, since: str = None):
         """
@@ -818,18 +1109,12 @@ class Repo:
             if n <= 0:
                 raise ValueError("n must be greater than 0.")
 
-            res = self.git.log("-n", n, self._log_format, filename).strip()
+            return list(self._iter_log(filename, max_count=n))
 
         if since is not None:
-            res = self.git.log("--since", since, self._log_format, filename).strip()
-
-        # Process log string.
-        res = res.replace("\n", ",")
-        res = "[" + res + "]"
-        commits = json.loads(res)
-        commits = [Commit(self, **commit) for commit in commits]
+            return list(self._iter_log("--since", since, filename))
 
-        return commits
+        raise ValueError("One of n or since must be provided.")
 
     def file_at_commits(
         self, filename: str = None, commits: List[Commit] = None
@@ -855,11 +1140,14 @@ class Repo:
         if not isinstance(commits, list):
             raise TypeError("commits must be a list of Commit objects.")
 
-        # Get file contents at each commit
+        # Read the file straight from each commit's tree rather than
+        # checking out the whole work tree.  './' makes the path
+        # relative to the repo directory instead of the repo root.
+        path = os.path.relpath(filename, self._dir)
         fileroot, fileext = os.path.splitext(filename)
         for commit in commits:
-            commit.checkout()
-            if not os.path.exists(filename):
+            _, kind, raw = self._read_object(f"{commit.sha}:./{path}")
+            if kind != "blob":
                 print(f"'{filename}' does not exist at {commit.sha}, skipping.")
                 continue
 
@@ -867,7 +1155,8 @@ class Repo:
             ts = ts + "-" + commit.sha[:6]
 
             fn_new = fileroot + ts + fileext
-            shutil.copy(filename, fn_new)
+            with open(fn_new, "wb") as fp:
+                fp.write(raw)
 
     def metrics_to_csv(self, filename: str = "metrics.csv") -> None:
         """
@@ -1,17 +1,36 @@
 from invoke import task, Context
 import typing
+import os
+import functools
 from tasks_doc import *
 from rich import print
 from usbtiny import USBTiny
 
 
+@functools.lru_cache(maxsize=None)
+def _usbtiny() -> USBTiny:
+    """
+    USBTiny instance shared by the tasks in this run, so the device
+    table is only read once.
+    """
+
+    return USBTiny()
+
+
 @task
 def devices(ctx: Context):
     """
     List USB devices
     """
 
-    print(USBTiny().table)
+    from rich.table import Table
+
+    devices = _usbtiny().table
+    table = Table(*(devices[0] if devices else []))
+    for device in devices:
+        table.add_row(*device.values())
+
+    print(table)
 
 
 @task
@@ -19,9 +38,7 @@ def connect(ctx: Context, quiet: bool = False):
     """
     Attach USBtiny device to WSL USB.
     """
-    from usbtiny import USBTiny
-
-    usbtiny = USBTiny()
+    usbtiny = _usbtiny()
 
     # UI
     if not quiet:
@@ -40,7 +57,7 @@ def connect(ctx: Context, quiet: bool = False):
         print("")
         print("[bold red]Connection Failed[/bold red]")
         print("   [yellow]Open Windows PowerSheel as Administrator and run:[/yellow]")
-        print(f'   usbipd.exe wsl attach --busid {status["BUSID"]}')
+        print(f"   usbipd.exe wsl attach --busid {usbtiny.busid}")
 
 
 @task
@@ -49,10 +66,16 @@ def clean(ctx: Context):
     Clean build files.
     """
 
-    types = ["o", "elf", "hex"]  # Build output
+    types = ["o", "elf", "hex", "stamp"]  # Build output
     types.append("vcd")  # Simulation output
-    for t in types:
-        ctx.run("rm -rf *." + t, echo=True)
+    suffixes = tuple("." + t for t in types)
+
+    # Single directory scan rather than a shell glob per type.
+    with os.scandir(".") as it:
+        for entry in it:
+            if entry.name.endswith(suffixes) and entry.is_file():
+                print(f"rm {entry.name}")
+                os.unlink(entry.path)
 
 
 @task
@@ -66,7 +89,7 @@ def flash(ctx: Context):
         make(ctx)
 
     # Check for connection.
-    usbtiny = USBTiny()
+    usbtiny = _usbtiny()
 
     # Check for device
     if not usbtiny.is_attached:
@@ -131,7 +154,9 @@ def make(
     # TODO: Set up application build data so that other functions can access it.
     # TODO: Use doc_pre() to detrmine if we need to execute a step.
 
-    from glob import glob
+    from pathlib import Path
+    import hashlib
+    from concurrent.futures import ThreadPoolExecutor
 
     # Read in makefile
     with open("makefile", "r") as fp:
@@ -142,8 +167,10 @@ def make(
     F_CPU = int(1e6)
     DEVICE = "attiny85"
 
+    # Copy so the default list isn't extended on every call.
     if not isinstance(cflags, list):
         cflags = [cflags]
+    cflags = list(cflags)
 
     cflags.append(f"-DF_CPU={F_CPU}")
     cflags.append(f"-mmcu={DEVICE}")
@@ -157,20 +184,52 @@ def make(
     cflags = " ".join(cflags)
 
     # Build the C files
-    src = glob("*.c")
-    obj = [file.replace(".c", ".o") for file in src]
-
-    for srcfile, objfile in zip(src, obj):
-        cmd = f"{compiler} {cflags} -c {srcfile} -o {objfile}"
+    src = list(Path().glob("*.c"))
+    obj = [file.with_suffix(".o") for file in src]
+
+    def mtime(file: str) -> float:
+        return os.path.getmtime(file) if os.path.exists(file) else 0
+
+    # Changed flags invalidate every object, so rebuild everything.
+    stamp = ".cflags.stamp"
+    digest = hashlib.sha1(cflags.encode()).hexdigest()
+    stamped = None
+    if os.path.exists(stamp):
+        with open(stamp, "r") as fp:
+            stamped = fp.read()
+    if stamped != digest:
+        for objfile in obj:
+            if os.path.exists(objfile):
+                os.remove(objfile)
+        with open(stamp, "w") as fp:
+            fp.write(digest)
+
+    # Only compile objects older than their source or any header.
+    headers = max((mtime(file) for file in Path().glob("*.h")), default=0)
+    cmds = [
+        f"{compiler} {cflags} -c {srcfile} -o {objfile}"
+        for srcfile, objfile in zip(src, obj)
+        if mtime(objfile) < max(mtime(srcfile), headers)
+    ]
+
+    # Translation units are independent, compile them in parallel.
+    # Iterating the results re-raises the first failed compile.  No stdin,
+    # so the runners don't race on the terminal mode or for keystrokes.
+    with ThreadPoolExecutor(max_workers=os.cpu_count()) as pool:
+        list(pool.map(lambda cmd: ctx.run(cmd, echo=True, in_stream=False), cmds))
+
+    # Link the objects, unless the binary is newer than all of them.
+    # With no objects there's nothing to check against, so always link.
+    elf = f"{target}.elf"
+    if not obj or mtime(elf) < max(mtime(file) for file in obj):
+        cmd = f"{compiler} {cflags} -o {elf} {' '.join(map(str, obj))}"
         ctx.run(cmd, echo=True)
 
-    # Link the objects
-    cmd = f"{compiler} {cflags} -o {target}.elf {' '.join(obj)}"
-    ctx.run(cmd, echo=True)
-
-    # Flashable file
-    cmd = f"avr-objcopy -j .text -j .data -O ihex {target}.elf  {target}.hex"
-    ctx.run(cmd, echo=True)
+    # Flashable file, regenerated whenever missing or older than the binary.
+    hexfile = f"{target}.hex"
+    if mtime(hexfile) < mtime(elf):
+        cmd = f"avr-objcopy -j .text -j .data -O ihex {elf}  {hexfile}"
+        ctx.run(cmd, echo=True)
 
     # Size info
     print("")
@@ -1,5 +1,22 @@
 from invoke import task
 import os
+import itertools
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import orjson
+
+    def _json_dumps(data) -> bytes:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_SORT_KEYS)
+
+    _json_loads = orjson.loads
+except ImportError:
+    import json
+
+    def _json_dumps(data) -> bytes:
+        return json.dumps(data, indent=2, sort_keys=True).encode()
+
+    _json_loads = json.loads
 
 # To see list of supported commands:
 # >> invoke --list
@@ -7,39 +24,89 @@ import os
 DOC_PRE_FILENAME = ".doc.pre.json"
 DOC_POST_FILENAME = ".doc.post.json"
 
+# Files past this many in a directory are stat'ed from a thread pool.
+STAT_THREADS_MIN = 2000
+STAT_THREADS = 32
+
+
+def _mtimes(entries: list) -> list:
+    """
+    Modification times for a list of directory entries.
+    """
+
+    return [(entry.name, entry.stat().st_mtime) for entry in entries]
+
+
+def _write_atomic(filename: str, blob: bytes) -> None:
+    """
+    Writes file contents via a temporary file and rename, so readers never
+    see a partly written file.
+    """
+
+    tmp = filename + ".tmp"
+    with open(tmp, "wb") as fp:
+        fp.write(blob)
+    os.replace(tmp, filename)
+
 
 def file_times(path: str = None) -> dict:
     """
     Captures list of files and modification times to dictionary.
+    Subdirectories and symbolic links are not included.
     """
 
     if path is None:
         raise ValueError("path must be specified.")
 
-    # Get list of files in current directory
-    curdir = os.getcwd()
-    os.chdir(path)
-    files = os.listdir()
-
-    # Create dictionary of file names and modification times
+    # Create dictionary of file names and modification times.
     results = {}
     results["directory"] = path
-    file_dict = {}
-    for file in files:
-        file_dict[file] = os.path.getmtime(file)
-    os.chdir(curdir)
-    results["files"] = file_dict
+    results["files"] = dict(_iter_file_times(path))
 
     return results
 
 
+def _iter_file_times(path: str):
+    """
+    Yields (name, modification time) for each regular file in a directory.
+    """
+
+    # One directory read, no chdir needed.  Where supported, scan an
+    # open directory fd so each stat is relative to it instead of
+    # resolving the full path again.
+    fd = os.open(path, os.O_RDONLY) if os.scandir in os.supports_fd else None
+    try:
+        with os.scandir(path if fd is None else fd) as it:
+            # Regular files only, the type test comes with the directory
+            # read so directories and links cost no stat.
+            files = (entry for entry in it if entry.is_file(follow_symlinks=False))
+
+            # Small directories are stat'ed as they're read, nothing is listed.
+            for entry in itertools.islice(files, STAT_THREADS_MIN):
+                yield entry.name, entry.stat().st_mtime
+
+            entries = list(files)
+
+        # Stats are latency bound on network file systems, keep many in
+        # flight for large directories.  Each thread takes a whole slice
+        # so local file systems don't pay per-file task overhead.
+        if entries:
+            size = -(-len(entries) // STAT_THREADS)
+            slices = [entries[i : i + size] for i in range(0, len(entries), size)]
+            with ThreadPoolExecutor(max_workers=STAT_THREADS) as pool:
+                for part in pool.map(_mtimes, slices):
+                    yield from part
+    finally:
+        if fd is not None:
+            os.close(fd)
+
+
 @task
 def doc_pre(ctx, path: str = None):
     """
-    Captures list of files and modification times to a JSON file.
+    Captures list of files and modification times to a manifest file.
     """
 
-    import json
     import sys
 
     if path is None:
@@ -51,11 +118,12 @@ def doc_pre(ctx, path: str = None):
     # Capture command line used to call simulation.
     data["command"] = os.path.basename(" ".join(sys.argv))
 
-    with open(DOC_PRE_FILENAME, "w") as fp:
-        json.dump(data, fp, indent=4)
+    _write_atomic(DOC_PRE_FILENAME, _json_dumps(data))
 
-    if os.path.isfile(DOC_POST_FILENAME):
-        os.remove(DOC_POST_FILENAME)
+    try:
+        os.unlink(DOC_POST_FILENAME)
+    except FileNotFoundError:
+        pass
 
 
 @task
@@ -63,46 +131,39 @@ def doc(ctx):
     """
     Generates simulation result documentation (Work in progress)
     """
-    import json
     from repo import Repo
 
-    if not os.path.isfile(DOC_PRE_FILENAME):
-        raise Exception("doc_pre() must be run before doc(), or: inv doc-pre")
-
-    with open(DOC_PRE_FILENAME, "r") as fp:
-        data = json.load(fp)
+    try:
+        with open(DOC_PRE_FILENAME, "rb") as fp:
+            data = _json_loads(fp.read())
+    except FileNotFoundError:
+        raise Exception("doc_pre() must be run before doc(), or: inv doc-pre") from None
 
     pre = data["files"]
-    post = file_times(path=data["directory"])["files"]
-
-    # Generate list of new and modified files
-    files_mod = list(set(post.keys()) - set(pre.keys()))
-    for file in post.keys():
-        if file in pre.keys():
-            if post[file] > pre[file]:
-                files_mod.append(file)
-    files_mod.sort()
-    if DOC_PRE_FILENAME in files_mod:
-        files_mod.remove(DOC_PRE_FILENAME)
-    if DOC_POST_FILENAME in files_mod:
-        files_mod.remove(DOC_POST_FILENAME)
-    data["files"] = files_mod
 
-    # Nice output
-    data = dict(sorted(data.items()))
+    # Generate list of new and modified files, less our own files.
+    # Files are compared as they're scanned rather than collected into a
+    # second dictionary first.
+    skip = {DOC_PRE_FILENAME, DOC_POST_FILENAME}
+    files_mod = sorted(
+        file
+        for file, mtime in _iter_file_times(data["directory"])
+        if file not in skip and pre.get(file) != mtime
+    )
+    data["files"] = files_mod
 
     # Analysis may have dumped data, create or update
-    if not os.path.isfile(DOC_POST_FILENAME):
-        # Create new file
-        with open(DOC_POST_FILENAME, "w") as fp:
-            json.dump(data, fp, indent=4)
-    else:
-        # Update existing file
-        with open(DOC_POST_FILENAME, "r") as fp:
-            doc_existing = json.load(fp)
-        doc_existing.update(data)
-        with open(DOC_POST_FILENAME, "w") as fp:
-            json.dump(doc_existing, fp, indent=4)
+    try:
+        with open(DOC_POST_FILENAME, "rb") as fp:
+            existing = fp.read()
+        data = _json_loads(existing) | data
+    except FileNotFoundError:
+        existing = None
+
+    # Skip the write if nothing changed.
+    blob = _json_dumps(data)
+    if blob != existing:
+        _write_atomic(DOC_POST_FILENAME, blob)
 
 
 if __name__ == "__main__":
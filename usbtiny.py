@@ -1,15 +1,46 @@
 # Desc: USBtiny device class.
 # Helper class to manage USBtiny device connection to WSL USB bus.
 
-import sh
-from io import StringIO
-import pandas as pd
+import re
+import time
+import shutil
+import functools
+import subprocess
+
+# Columns in 'usbipd list' output are separated by two or more spaces,
+# single spaces appear within device names.
+_COL_SPLIT = re.compile(r"\s{2,}")
+
+
+@functools.cache
+def _usbipd_path() -> str:
+    """
+    Full path of usbipd.exe, looked up once.
+
+    Raises:
+        FileNotFoundError: If usbipd.exe is not on the PATH.
+    """
+
+    path = shutil.which("usbipd.exe")
+    if path is None:
+        raise FileNotFoundError("usbipd.exe not found on PATH")
+
+    return path
 
 
 class USBTiny:
-    def __init__(self):
-        self._usbipd = sh.Command("usbipd.exe")
+    def __init__(self, ttl: float = 1.0):
+        """
+        Args:
+            ttl (float, optional): Seconds a device table read is reused.
+                                   Defaults to 1.0.
+        """
+
+        self._usbipd = _usbipd_path()
+        self._ttl = ttl
         self._table = None
+        self._table_time = 0
+        self._status = None
 
     def update(self) -> None:
         """
@@ -19,16 +50,25 @@ class USBTiny:
             RuntimeError: If USBtiny device not found on USB bus.
         """
 
-        devices = self._usbipd("list")
-        df = pd.read_table(
-            StringIO(devices), engine="python", header=1, sep="\s{2,}", index_col=False
+        res = subprocess.run(
+            [self._usbipd, "list"], capture_output=True, text=True, check=True
         )
+        lines = res.stdout.splitlines()
+        header = _COL_SPLIT.split(lines[1].strip())
 
         # Drop stuff below the main table.
-        idx = df[df["BUSID"] == "Persisted:"].index.values[0]
-        df.drop(df.index[idx:], inplace=True)
-
-        self._table = df
+        rows = []
+        for line in lines[2:]:
+            if line.startswith("Persisted:"):
+                break
+            if line.strip():
+                rows.append(dict(zip(header, _COL_SPLIT.split(line.strip()))))
+
+        self._table = rows
+        self._table_time = time.monotonic()
+        self._status = next(
+            (row for row in rows if row.get("DEVICE") == "USBtiny"), None
+        )
 
     @property
     def status(self) -> dict:
@@ -39,27 +79,26 @@ class USBTiny:
             dict: USBtiny device status record.
         """
 
-        df = self.table
-        try:
-            device = df[df["DEVICE"] == "USBtiny"].to_dict(orient="records")[0]
-        except KeyError:
+        # Refreshes the table and record once stale.
+        self.table
+        if self._status is None:
             raise RuntimeError(
                 "USBtiny device not found on USB bus, see 'usbipd.exe list'"
             )
 
-        return device
+        return self._status
 
     @property
-    def table(self) -> pd.DataFrame:
+    def table(self) -> list:
         """
         USB device connection table.
-        Accessing this property forces a table update.
+        Re-read once older than the instance's ttl.
 
         Returns:
-            pandas.DataFrame: Table of USB device info.
+            list: Device records, dictionaries keyed by column name.
         """
 
-        if self._table is None:
+        if self._table is None or time.monotonic() - self._table_time > self._ttl:
             self.update()
 
         return self._table
@@ -105,8 +144,16 @@ class USBTiny:
             bool: True if device attached.
         """
 
+        cmd = ["sudo", self._usbipd, "wsl", "attach", "--busid", self.busid]
         try:
-            sh.contrib.sudo(self._usbipd._path, "wsl", "attach", "--busid", self.busid)
-            return True
-        except sh.ErrorReturnCode_3:
-            return False
+            subprocess.run(cmd, capture_output=True, check=True)
+        except subprocess.CalledProcessError as err:
+            if err.returncode == 3:
+                return False
+            raise
+
+        # Device state changed, re-read on next access.
+        self._table = None
+        self._status = None
+
+        return True